@@ -5,28 +5,46 @@
 """
 
 import os
+import re
 import time
 import json
 import base64
+import random
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import streamlit as st
 import requests
 import gspread
 import bcrypt
-import pandas as pd
-from oauth2client.service_account import ServiceAccountCredentials
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from google.oauth2.service_account import Credentials
 
 # ===================== 설정 =====================
 API_HOST = "https://api.commerce.naver.com"
 TOKEN_URL = f"{API_HOST}/external/v1/oauth2/token"
 REQUEST_TIMEOUT = 30
 MAX_WORKERS = 20
+POOL_SIZE = 32
+TOKEN_CONCURRENCY = 4      # 동시 토큰 발급 요청 수 (OAuth 429 방지)
+QUERY_CHUNK_SIZE = 100     # 상품주문 조회 API 1회당 최대 주문번호 수
+PROGRESS_INTERVAL = 0.1    # 진행률 표시 최소 갱신 간격 (초)
+MARKET_HINT_TOP_K = 2      # 먼저 조회할 최근 처리 마켓 수
+MARKET_HINT_SIZE = 50      # 세션별 마켓 처리 이력 최대 개수
+TOKEN_TTL = 10800          # 네이버 토큰 기본 유효시간 (초)
+TOKEN_REFRESH_MARGIN = 60  # 만료 전 갱신 여유 (초)
 STORES_SHEET = "마켓정보"
 # ================================================
 
+_SPLIT_RE = re.compile(r"[,\s]+")
+_ORDER_ID_RE = re.compile(r"[0-9]+")
+
 # ========== 페이지 설정 ==========
 st.set_page_config(
     page_title="발송지연 처리",
@@ -35,7 +53,7 @@ st.set_page_config(
 )
 
 # ========== CSS 스타일 ==========
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2rem;
@@ -76,7 +94,11 @@ st.markdown("""
         background-color: #02a84d;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+# 처리 결과 박스 (box_class: success-box / error-box)
+RESULT_BOX_TMPL = '<div class="{box_class}"><strong>{oid}</strong> ({market})<br>{message}</div>'
 
 
 # ========== 유틸 함수 ==========
@@ -182,6 +204,67 @@ def show_settings_page():
             st.error("❌ credentials.json과 스프레드시트 키를 모두 입력해주세요.")
 
 
+# ========== HTTP 세션 ==========
+class JitterRetry(Retry):
+    """첫 재시도부터 지터가 섞인 대기시간을 두는 Retry
+
+    urllib3는 첫 재시도를 대기 없이 보내므로, 여러 스레드가 동시에 429를 받으면
+    같은 순간에 다시 몰립니다.
+    """
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff == 0 and self.history:
+            backoff = self.backoff_factor
+        return backoff * random.uniform(0.5, 1.5)
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """네이버 API 공용 세션 (토큰/조회용, keep-alive 커넥션 재사용)"""
+    retry = JitterRetry(
+        total=2,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    return _build_session(retry)
+
+
+@st.cache_resource
+def get_dispatch_session() -> requests.Session:
+    """발송지연 처리용 세션
+
+    서버에 상태를 반영하는 요청이므로, 요청이 처리되지 않은 것이 확실한
+    연결 실패와 429만 재시도합니다 (5xx/읽기 타임아웃은 재시도하지 않음).
+    """
+    retry = JitterRetry(
+        total=2,
+        connect=2,
+        read=0,
+        other=0,
+        backoff_factor=0.5,
+        status_forcelist=[429],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    return _build_session(retry)
+
+
+def _build_session(retry: Retry) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_query_semaphore() -> threading.BoundedSemaphore:
+    """조회/처리 API 동시 요청 수 제한 (커넥션 풀 크기와 동일)"""
+    return threading.BoundedSemaphore(POOL_SIZE)
+
+
 # ========== 인증 ==========
 def sign_client_secret(client_id: str, client_secret: str, ts_ms: int) -> str:
     pwd = f"{client_id}_{ts_ms}".encode("utf-8")
@@ -189,26 +272,102 @@ def sign_client_secret(client_id: str, client_secret: str, ts_ms: int) -> str:
     return base64.b64encode(hashed).decode("utf-8")
 
 
-def get_access_token(client_id: str, client_secret: str) -> Optional[str]:
-    ts = int(time.time() * 1000)
-    data = {
-        "grant_type": "client_credentials",
-        "client_id": client_id,
-        "timestamp": ts,
-        "client_secret_sign": sign_client_secret(client_id, client_secret, ts),
-        "type": "SELF",
+@st.cache_resource
+def get_token_store() -> Dict[str, Any]:
+    """프로세스 공용 토큰 캐시 (client_id -> (토큰, 만료시각))"""
+    return {
+        "lock": threading.Lock(),
+        "tokens": {},
+        "client_locks": {},
+        "semaphore": threading.BoundedSemaphore(TOKEN_CONCURRENCY),
     }
+
+
+def _cached_token(store: Dict[str, Any], client_id: str) -> Optional[str]:
+    with store["lock"]:
+        cached = store["tokens"].get(client_id)
+    if cached and cached[1] - time.time() > TOKEN_REFRESH_MARGIN:
+        return cached[0]
+    return None
+
+
+def get_access_token(client_id: str, client_secret: str) -> Optional[str]:
+    """만료 전까지 캐시된 토큰을 재사용하고, 없으면 새로 발급
+
+    같은 client_id에 대한 동시 요청은 한 번만 서명(bcrypt)/발급합니다.
+    """
+    store = get_token_store()
+    token = _cached_token(store, client_id)
+    if token:
+        return token
+
+    with store["lock"]:
+        client_lock = store["client_locks"].setdefault(client_id, threading.Lock())
+
+    with client_lock:
+        token = _cached_token(store, client_id)
+        if token:
+            return token
+
+        token, expires_in = fetch_access_token(client_id, client_secret)
+        if token:
+            with store["lock"]:
+                store["tokens"][client_id] = (token, time.time() + expires_in)
+    return token
+
+
+def refresh_access_token(market: Dict, stale_token: str) -> Optional[str]:
+    """거부된(401) 토큰을 캐시에서 제거하고 새로 발급"""
+    store = get_token_store()
+    with store["lock"]:
+        cached = store["tokens"].get(market["client_id"])
+        if cached and cached[0] == stale_token:
+            del store["tokens"][market["client_id"]]
+    return get_access_token(market["client_id"], market["client_secret"])
+
+
+def fetch_access_token(client_id: str, client_secret: str) -> Tuple[Optional[str], int]:
     headers = {"Content-Type": "application/x-www-form-urlencoded", "Accept": "application/json"}
     try:
-        r = requests.post(TOKEN_URL, data=data, headers=headers, timeout=REQUEST_TIMEOUT)
+        # client_secret 형식이 잘못되면 bcrypt가 ValueError를 던지므로 try 안에서 서명
+        ts = int(time.time() * 1000)
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": client_id,
+            "timestamp": ts,
+            "client_secret_sign": sign_client_secret(client_id, client_secret, ts),
+            "type": "SELF",
+        }
+        with get_token_store()["semaphore"]:
+            r = get_session().post(TOKEN_URL, data=data, headers=headers, timeout=REQUEST_TIMEOUT)
         if r.status_code == 200:
-            return r.json().get("access_token")
+            response = orjson.loads(r.content)
+            return response.get("access_token"), int(response.get("expires_in", TOKEN_TTL))
     except:
         pass
-    return None
+    return None, 0
 
 
 # ========== 구글 시트 ==========
+GSPREAD_SCOPE = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive",
+]
+
+
+@st.cache_resource(show_spinner=False)
+def get_gspread_client(creds_json_str: str) -> gspread.Client:
+    """인증된 gspread 클라이언트 (프로세스 단위 캐시)"""
+    creds = Credentials.from_service_account_info(json.loads(creds_json_str), scopes=GSPREAD_SCOPE)
+    return gspread.authorize(creds)
+
+
+@st.cache_resource(show_spinner=False)
+def get_spreadsheet(spreadsheet_key: str, creds_json_str: str) -> gspread.Spreadsheet:
+    """스프레드시트 핸들 (프로세스 단위 캐시)"""
+    return get_gspread_client(creds_json_str).open_by_key(spreadsheet_key)
+
+
 def load_markets(config: Dict) -> List[Dict]:
     """마켓 정보 로드"""
     credentials = config.get("credentials")
@@ -217,81 +376,172 @@ def load_markets(config: Dict) -> List[Dict]:
     if not credentials or not spreadsheet_key:
         raise ValueError("설정이 완료되지 않았습니다.")
 
-    scope = [
-        "https://spreadsheets.google.com/feeds",
-        "https://www.googleapis.com/auth/drive",
-    ]
-
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(credentials, scope)
-    gc = gspread.authorize(creds)
-
-    sh = gc.open_by_key(spreadsheet_key)
+    sh = get_spreadsheet(spreadsheet_key, json.dumps(credentials, sort_keys=True))
 
     try:
         ws = sh.worksheet(STORES_SHEET)
     except:
         ws = sh.get_worksheet(0)
 
-    values = ws.get_all_values()
+    # 헤더를 제외한 A~C열만 조회
+    values = ws.get("A2:C")
     markets = []
 
-    for i, row in enumerate(values[1:], start=2):
-        if len(row) >= 3:
-            store_name = S(row[0])
-            client_id = S(row[1])
-            client_secret = S(row[2])
-
-            if store_name and client_id and client_secret:
-                markets.append({
-                    "store_name": store_name,
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                })
+    for row in values:
+        row = (list(row) + ["", "", ""])[:3]
+        store_name = S(row[0])
+        client_id = S(row[1])
+        client_secret = S(row[2])
+
+        if store_name and client_id and client_secret:
+            markets.append({
+                "store_name": store_name,
+                "client_id": client_id,
+                "client_secret": client_secret,
+            })
 
     return markets
 
 
-# ========== API 호출 ==========
-def check_order_in_market(market: Dict, product_order_id: str) -> Optional[Dict]:
-    """특정 마켓에서 상품주문번호 조회"""
-    token = get_access_token(market["client_id"], market["client_secret"])
-    if not token:
-        return None
+@st.cache_data(ttl=600, show_spinner=False)
+def load_markets_cached(spreadsheet_key: str, creds_email: str) -> List[Dict]:
+    """마켓 정보 로드 (10분 캐시)
 
-    url = f"{API_HOST}/external/v1/pay-order/seller/product-orders/query"
+    캐시 키는 스프레드시트 키와 서비스 계정 이메일만 사용하고,
+    인증 정보는 내부에서 다시 가져옵니다.
+    """
+    return load_markets(get_config())
+
+
+# ========== API 호출 ==========
+def _post_json(session: requests.Session, url: str, token: str, payload: Dict) -> requests.Response:
     headers = {
         "Authorization": f"Bearer {token}",
         "Accept": "application/json",
         "Content-Type": "application/json"
     }
-    payload = {"productOrderIds": [product_order_id]}
+    with get_query_semaphore():
+        return session.post(url, headers=headers, data=orjson.dumps(payload), timeout=REQUEST_TIMEOUT)
+
 
+def query_market_bulk(market: Dict, order_ids: List[str]) -> Tuple[Dict[str, Dict], Optional[str]]:
+    """특정 마켓에서 여러 상품주문번호를 한 번에 조회
+
+    (상품주문번호 -> 조회 결과, 조회 실패 시 오류 메시지)를 반환합니다.
+    """
+    found: Dict[str, Dict] = {}
+    error = None
+    token = get_access_token(market["client_id"], market["client_secret"])
+    if not token:
+        return found, "토큰 발급 실패"
+
+    url = f"{API_HOST}/external/v1/pay-order/seller/product-orders/query"
+    token_refreshed = False
+
+    for start in range(0, len(order_ids), QUERY_CHUNK_SIZE):
+        payload = {"productOrderIds": order_ids[start:start + QUERY_CHUNK_SIZE]}
+        try:
+            r = _post_json(get_session(), url, token, payload)
+            # 캐시된 토큰이 거부되면 한 번만 재발급 후 재시도
+            if r.status_code == 401 and not token_refreshed:
+                token_refreshed = True
+                token = refresh_access_token(market, token)
+                if not token:
+                    return found, "토큰 재발급 실패"
+                r = _post_json(get_session(), url, token, payload)
+            if r.status_code != 200:
+                error = f"조회 API 오류 ({r.status_code})"
+                continue
+            for item in orjson.loads(r.content).get("data", []) or []:
+                oid = S((item.get("productOrder") or {}).get("productOrderId"))
+                if oid:
+                    found[oid] = {
+                        "market": market,
+                        "token": token,
+                        "order_data": item
+                    }
+        except Exception as e:
+            error = f"요청 오류: {e}"
+    return found, error
+
+
+def _query_markets(markets: List[Dict], order_ids: List[str],
+                   found: Dict[str, Dict], failed: Dict[str, str]) -> None:
+    """마켓 목록에 병렬 일괄 조회 후 found/failed에 병합 (모두 찾으면 남은 조회 취소)"""
+    if not markets or not order_ids:
+        return
+
+    wanted = set(order_ids)
+    executor = ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(markets)))
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
-        if r.status_code == 200:
-            response = r.json()
-            data = response.get("data", [])
-            if data and len(data) > 0:
-                return {
-                    "market": market,
-                    "token": token,
-                    "order_data": response
-                }
-    except:
-        pass
-    return None
+        futures = {executor.submit(query_market_bulk, m, order_ids): m for m in markets}
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            # 한 마켓의 오류가 전체 배치를 중단시키지 않도록 마켓별로 처리
+            try:
+                market_found, error = future.result()
+            except Exception as e:
+                market_found, error = {}, f"조회 오류: {e}"
+            if error:
+                failed[futures[future]["store_name"]] = error
+            for oid, result in market_found.items():
+                if oid in wanted:
+                    found.setdefault(oid, result)
+            if wanted.issubset(found):
+                for f in futures:
+                    f.cancel()
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def find_orders_parallel(markets: List[Dict], order_ids: List[str],
+                         preferred: Optional[List[str]] = None) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """모든 마켓에 상품주문번호 목록을 병렬로 일괄 조회
+
+    preferred에 있는 마켓(최근 처리 마켓)을 먼저 조회하고,
+    못 찾은 주문번호만 나머지 마켓에서 조회합니다.
+    (상품주문번호 -> 조회 결과, 조회 실패 마켓명 -> 오류 메시지)를 반환합니다.
+    """
+    found: Dict[str, Dict] = {}
+    failed: Dict[str, str] = {}
+    preferred = set(preferred or [])
 
+    first = [m for m in markets if m["store_name"] in preferred]
+    rest = [m for m in markets if m["store_name"] not in preferred]
 
-def find_order_parallel(markets: List[Dict], product_order_id: str) -> Optional[Dict]:
-    """병렬로 모든 마켓에서 주문 찾기"""
-    # 순차 처리로 변경 (Streamlit Cloud 호환성)
-    for market in markets:
-        result = check_order_in_market(market, product_order_id)
-        if result:
-            return result
-    return None
+    _query_markets(first, order_ids, found, failed)
+    _query_markets(rest, [oid for oid in order_ids if oid not in found], found, failed)
+    return found, failed
+
+
+def get_preferred_markets() -> List[str]:
+    """이번 세션에서 처리 성공이 많은 마켓 순으로 상위 K개"""
+    hints = st.session_state.get("market_hints", {})
+    return sorted(hints, key=hints.get, reverse=True)[:MARKET_HINT_TOP_K]
 
 
+def record_market_hit(store_name: str) -> None:
+    """처리 성공한 마켓 기록 (세션별, 최근 사용 순으로 크기 제한)"""
+    hints = st.session_state.setdefault("market_hints", OrderedDict())
+    hints[store_name] = hints.get(store_name, 0) + 1
+    hints.move_to_end(store_name)
+    while len(hints) > MARKET_HINT_SIZE:
+        hints.popitem(last=False)
+
+
+# 지연 사유 키워드 -> API enum (위에서부터 우선 적용)
+_REASON_PATTERNS = (
+    (re.compile("해외|현지|배송중"), "OVERSEA_DELIVERY"),
+    (re.compile("제작"), "CUSTOM_BUILD"),
+    (re.compile("예약"), "RESERVED_DISPATCH"),
+    (re.compile("고객|구매자|요청"), "CUSTOMER_REQUEST"),
+    (re.compile("상품|준비|재고"), "PRODUCT_PREPARE"),
+)
+
+
+@lru_cache(maxsize=64)
 def get_delay_reason_code(delay_reason: str) -> str:
     """지연 사유를 API enum 코드로 변환
 
@@ -303,29 +553,19 @@ def get_delay_reason_code(delay_reason: str) -> str:
     - OVERSEA_DELIVERY: 해외배송
     - CUSTOMER_REQUEST: 고객요청
     """
-    if "해외" in delay_reason or "현지" in delay_reason or "배송중" in delay_reason:
-        return "OVERSEA_DELIVERY"
-    elif "주문제작" in delay_reason or "제작" in delay_reason:
-        return "CUSTOM_BUILD"
-    elif "예약" in delay_reason:
-        return "RESERVED_DISPATCH"
-    elif "고객" in delay_reason or "구매자" in delay_reason or "요청" in delay_reason:
-        return "CUSTOMER_REQUEST"
-    elif "상품" in delay_reason or "준비" in delay_reason or "재고" in delay_reason:
-        return "PRODUCT_PREPARE"
-    else:
-        return "ETC"
+    for pattern, code in _REASON_PATTERNS:
+        if pattern.search(delay_reason):
+            return code
+    return "ETC"
 
 
 def execute_delay_dispatch(token: str, product_order_id: str,
-                           dispatch_due_date: str, delay_reason: str) -> Dict:
-    """발송지연 처리 API 호출"""
+                           dispatch_due_date: str, delay_reason: str,
+                           market: Optional[Dict] = None) -> Dict:
+    """발송지연 처리 API 호출
 
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
+    market이 주어지면 토큰이 거부(401)될 때 한 번 재발급 후 재시도합니다.
+    """
 
     iso_date = f"{dispatch_due_date}T23:59:59.000+09:00"
     reason_code = get_delay_reason_code(delay_reason)
@@ -339,12 +579,16 @@ def execute_delay_dispatch(token: str, product_order_id: str,
     }
 
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
+        r = _post_json(get_dispatch_session(), url, token, payload)
+        if r.status_code == 401 and market:
+            token = refresh_access_token(market, token)
+            if token:
+                r = _post_json(get_dispatch_session(), url, token, payload)
         if r.status_code == 200:
             return {"success": True, "message": f"발송지연 처리 완료 ({reason_code})"}
         else:
             try:
-                error_data = r.json()
+                error_data = orjson.loads(r.content)
                 error_msg = error_data.get("message", r.text)
             except:
                 error_msg = r.text
@@ -364,6 +608,7 @@ def main_app():
     with st.sidebar:
         st.subheader("설정")
         if st.button("⚙️ 설정 변경"):
+            load_markets_cached.clear()
             st.session_state["config_complete"] = False
             if "user_credentials" in st.session_state:
                 del st.session_state["user_credentials"]
@@ -373,7 +618,10 @@ def main_app():
 
     # 마켓 정보 로드
     try:
-        markets = load_markets(config)
+        markets = load_markets_cached(
+            S(config.get("spreadsheet_key")),
+            S((config.get("credentials") or {}).get("client_email"))
+        )
         st.markdown(f'''
         <div class="market-info">
             ✅ 연동된 마켓: <strong>{len(markets)}개</strong>
@@ -382,6 +630,7 @@ def main_app():
     except Exception as e:
         st.error(f"❌ 마켓 정보 로드 실패: {e}")
         if st.button("설정 다시하기"):
+            load_markets_cached.clear()
             st.session_state["config_complete"] = False
             st.rerun()
         return
@@ -425,9 +674,8 @@ def main_app():
 
     # 처리 버튼
     if st.button("🚀 발송지연 처리", type="primary"):
-        order_ids = [
-            S(x) for x in order_input.replace(",", "\n").split("\n") if S(x)
-        ]
+        # 쉼표/공백/줄바꿈으로 분리, 입력 순서를 유지하며 중복 제거
+        order_ids = list(dict.fromkeys(x for x in _SPLIT_RE.split(order_input) if x))
 
         if not order_ids:
             st.warning("⚠️ 상품주문번호를 입력해주세요.")
@@ -439,40 +687,82 @@ def main_app():
         st.divider()
         st.subheader("처리 결과")
 
-        results = []
         progress_bar = st.progress(0)
         status_text = st.empty()
 
         start_time = time.time()
 
-        for i, order_id in enumerate(order_ids):
-            status_text.text(f"처리 중... ({i+1}/{len(order_ids)}) - {order_id}")
-            progress_bar.progress((i) / len(order_ids))
+        # 숫자가 아닌 주문번호는 일괄 조회 요청 전체를 실패시키므로 미리 제외
+        valid_ids = [oid for oid in order_ids if _ORDER_ID_RE.fullmatch(oid)]
 
-            found = find_order_parallel(markets, order_id)
+        status_text.text(f"주문 조회 중... ({len(valid_ids)}건, {len(markets)}개 마켓)")
+        found_orders, failed_markets = find_orders_parallel(markets, valid_ids, get_preferred_markets())
 
-            if not found:
-                results.append({
+        not_found_msg = "해당 상품주문번호를 찾을 수 없습니다."
+        if failed_markets:
+            st.warning("⚠️ 조회 실패 마켓: " + ", ".join(
+                f"{name} ({error})" for name, error in failed_markets.items()
+            ))
+            not_found_msg += f" (조회 실패 마켓 {len(failed_markets)}개 제외)"
+
+        result_map: Dict[str, Dict] = {}
+        for order_id in order_ids:
+            if not _ORDER_ID_RE.fullmatch(order_id):
+                result_map[order_id] = {
                     "상품주문번호": order_id,
                     "마켓": "-",
                     "결과": "❌ 실패",
-                    "메시지": "해당 상품주문번호를 찾을 수 없습니다."
-                })
-                continue
+                    "메시지": "상품주문번호 형식이 올바르지 않습니다. (숫자만 입력)"
+                }
+            elif order_id not in found_orders:
+                result_map[order_id] = {
+                    "상품주문번호": order_id,
+                    "마켓": "-",
+                    "결과": "❌ 실패",
+                    "메시지": not_found_msg
+                }
 
-            delay_result = execute_delay_dispatch(
-                found["token"],
-                order_id,
-                dispatch_date_str,
-                final_reason
-            )
-
-            results.append({
-                "상품주문번호": order_id,
-                "마켓": found["market"]["store_name"],
-                "결과": "✅ 성공" if delay_result["success"] else "❌ 실패",
-                "메시지": delay_result["message"]
+        hits = [(oid, found_orders[oid]) for oid in order_ids if oid in found_orders]
+        if hits:
+            with ThreadPoolExecutor(max_workers=min(POOL_SIZE, len(hits))) as executor:
+                futures = {
+                    executor.submit(
+                        execute_delay_dispatch,
+                        found["token"],
+                        order_id,
+                        dispatch_date_str,
+                        final_reason,
+                        found["market"]
+                    ): (order_id, found["market"])
+                    for order_id, found in hits
+                }
+                last_update = 0.0
+                for done, future in enumerate(as_completed(futures), start=1):
+                    order_id, market = futures[future]
+                    delay_result = future.result()
+                    if delay_result["success"]:
+                        record_market_hit(market["store_name"])
+                    result_map[order_id] = {
+                        "상품주문번호": order_id,
+                        "마켓": market["store_name"],
+                        "결과": "✅ 성공" if delay_result["success"] else "❌ 실패",
+                        "메시지": delay_result["message"]
+                    }
+                    if time.time() - last_update > PROGRESS_INTERVAL:
+                        status_text.text(f"처리 중... ({done}/{len(hits)}) - {order_id}")
+                        progress_bar.progress(done / len(hits))
+                        last_update = time.time()
+
+        results = [result_map[oid] for oid in order_ids]
+        html_parts = [
+            RESULT_BOX_TMPL.format_map({
+                "box_class": "success-box" if "✅" in r["결과"] else "error-box",
+                "oid": r["상품주문번호"],
+                "market": r["마켓"],
+                "message": r["메시지"],
             })
+            for r in results
+        ]
 
         progress_bar.progress(1.0)
         total_time = time.time() - start_time
@@ -488,26 +778,13 @@ def main_app():
         col4.metric("소요시간", f"{total_time:.1f}초")
 
         st.dataframe(
-            pd.DataFrame(results),
+            results,
             use_container_width=True,
             hide_index=True
         )
 
-        for r in results:
-            if "✅" in r["결과"]:
-                st.markdown(f'''
-                <div class="success-box">
-                    <strong>{r["상품주문번호"]}</strong> ({r["마켓"]})<br>
-                    {r["메시지"]}
-                </div>
-                ''', unsafe_allow_html=True)
-            else:
-                st.markdown(f'''
-                <div class="error-box">
-                    <strong>{r["상품주문번호"]}</strong> ({r["마켓"]})<br>
-                    {r["메시지"]}
-                </div>
-                ''', unsafe_allow_html=True)
+        # 결과 박스는 한 번에 렌더링
+        st.markdown("\n".join(html_parts), unsafe_allow_html=True)
 
 
 def main():